@@ -2,28 +2,44 @@ import os
 import sys
 import shutil
 import json
+import re
+import urllib.request
+import urllib.error
 import threading
-import requests
+import queue
 import zipfile
 import tarfile
 from pathlib import Path
 import hashlib
+import hmac
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional, Tuple
 import logging
 import time
+import functools
+import mmap
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Windows平台特定导入
-try:
-    import win32com.client
-    import winreg
-    import pythoncom
-    WINDOWS = True
-except ImportError:
-    WINDOWS = False
+# Windows平台特定模块（pywin32）导入较慢，改为首次创建快捷方式时才导入
+WINDOWS = sys.platform == 'win32'
+win32com = None
+pythoncom = None
 
 # ===================== 基础配置与工具函数 =====================
+COPY_BUFSIZE = 1 << 20  # 文件读写/哈希的块大小
+DEFAULT_HASH_ALGORITHM = "blake2b"  # 完整性校验默认算法（比md5快，标准库自带）
+PROGRESS_STEP_BYTES = 1 << 20  # 下载每累计这么多字节上报一次进度
+PIPELINE_DEPTH = 16  # 下载→写盘流水线中最多缓存的数据块数
+UI_POLL_INTERVAL_MS = 50  # 主线程处理界面更新队列的间隔
+PROGRESS_MIN_INTERVAL = 1 / 30  # 进度条最短刷新间隔（秒），即不超过30Hz
+_NUMERIC_VERSION_RE = re.compile(r"\d+(?:\.\d+)*")  # 纯数字点分版本号（如1.2.3）
+HTTP_MAX_RETRIES = 3  # 网络请求失败后的最大重试次数
+HTTP_RETRY_BACKOFF = 0.3  # 重试的指数退避基数（秒）：0.3、0.6、1.2...
+HTTP_RETRY_STATUS = (502, 503, 504)  # 视为临时故障、需要重试的HTTP状态码
+MEMORY_ARCHIVE_MAX_BYTES = 64 * 1024 * 1024  # 不超过此大小的更新包直接下载到内存（更大的写临时文件，控制内存占用）
+
 def get_exe_dir():
     """获取当前exe/脚本所在的永久目录"""
     if hasattr(sys, '_MEIPASS'):
@@ -48,52 +64,110 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+@functools.lru_cache(maxsize=128)
+def _normalize_version(version: str) -> tuple[int, ...]:
+    """版本号字符串转为整数元组（结果缓存，重复比较同一版本号时不再解析）"""
+    version = version.strip()
+    if _NUMERIC_VERSION_RE.fullmatch(version):
+        # 常见的纯数字版本号直接整体转换
+        parts = list(map(int, version.split('.')))
+    else:
+        # 含非数字段（如-1、+1、1_0）的版本号，非数字段按0处理
+        parts = [int(part) if part.isdigit() else 0 for part in version.split('.')]
+    # 去掉末尾的0，使1.2与1.2.0比较结果相等，无需再补齐长度
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
 def compare_versions(v1: str, v2: str) -> int:
     """比较版本号：1(v1>v2) / 0(相等) / -1(v1<v2)"""
-    def normalize_version(version: str) -> list[int]:
-        parts = version.strip().split('.')
-        return [int(part) if part.isdigit() else 0 for part in parts]
-    
-    v1_parts = normalize_version(v1)
-    v2_parts = normalize_version(v2)
-    max_len = max(len(v1_parts), len(v2_parts))
-    v1_parts += [0] * (max_len - len(v1_parts))
-    v2_parts += [0] * (max_len - len(v2_parts))
-    
-    for p1, p2 in zip(v1_parts, v2_parts):
-        if p1 > p2:
-            return 1
-        elif p1 < p2:
-            return -1
-    return 0
-
-def calculate_file_hash(file_path: str, hash_algorithm: str = 'md5') -> str:
+    v1_parts = _normalize_version(v1)
+    v2_parts = _normalize_version(v2)
+    # 元组按字典序比较，由C层完成
+    return (v1_parts > v2_parts) - (v1_parts < v2_parts)
+
+def _hash_mmap(file_path: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
+    """把文件只读映射到内存后一次update完成哈希（单次C调用，期间释放GIL），返回哈希对象"""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        hash_obj = hashlib.new(hash_algorithm)
+        hash_obj.update(mapped)
+    return hash_obj
+
+def file_hash_object(file_path: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
+    """读取整个文件计算哈希，返回哈希对象（可继续update追加数据）"""
+    try:
+        return _hash_mmap(file_path, hash_algorithm)
+    except (ValueError, OSError):
+        # 空文件无法映射，或映射失败时退回分块读取
+        pass
+    with open(file_path, 'rb', buffering=0) as f:
+        # Python 3.11+ 在C层完成读取+哈希循环
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, hash_algorithm)
+        # 旧版本：读入预分配缓冲区，避免每块新建bytes对象
+        hash_obj = hashlib.new(hash_algorithm)
+        buffer = bytearray(COPY_BUFSIZE)
+        view = memoryview(buffer)
+        while size := f.readinto(view):
+            hash_obj.update(view[:size])
+    return hash_obj
+
+def calculate_file_hash(file_path: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
     """计算文件哈希值"""
     if not os.path.exists(file_path):
         return ""
-    hash_obj = hashlib.new(hash_algorithm)
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(4096):
-            hash_obj.update(chunk)
-    return hash_obj.hexdigest()
-
-def retry(max_retries=3, delay=1):
-    """重试装饰器"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            for i in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    logging.warning(f"第{i+1}次执行失败: {str(e)}，重试中...")
-                    if i == max_retries - 1:
-                        raise
-                    time.sleep(delay)
-            return None
-        return wrapper
-    return decorator
-
-def create_shortcut(target_path, shortcut_path, description="", icon_path=None):
+    return file_hash_object(file_path, hash_algorithm).hexdigest()
+
+def open_sequential(file_path: str, mode: str = 'rb'):
+    """以顺序访问提示打开二进制文件，加大预读并减少页缓存占用
+    
+    POSIX使用posix_fadvise(POSIX_FADV_SEQUENTIAL)，Windows使用O_SEQUENTIAL，
+    平台不支持时退化为普通打开
+    """
+    flags = {
+        'rb': os.O_RDONLY,
+        'wb': os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+        'ab': os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+    }[mode]
+    flags |= getattr(os, 'O_BINARY', 0) | getattr(os, 'O_SEQUENTIAL', 0)
+    f = os.fdopen(os.open(file_path, flags, 0o666), mode)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+def urlopen_with_retry(request, timeout: float):
+    """urllib.request.urlopen，连接错误及网关类错误按指数退避重试（最多HTTP_MAX_RETRIES次）
+    
+    其余HTTP错误（含304）直接抛出，由调用方处理
+    """
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        try:
+            return urllib.request.urlopen(request, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            if e.code not in HTTP_RETRY_STATUS or attempt == HTTP_MAX_RETRIES:
+                raise
+            e.close()
+            error = e
+        except OSError as e:
+            # URLError、超时、连接重置等
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+            error = e
+        delay = HTTP_RETRY_BACKOFF * (2 ** attempt)
+        logging.warning(f"第{attempt + 1}次请求失败: {str(error)}，{delay:.1f}秒后重试...")
+        time.sleep(delay)
+
+def _load_win32():
+    """按需导入pywin32并缓存到模块全局；未安装时抛出ImportError"""
+    global win32com, pythoncom
+    if pythoncom is None:
+        import win32com.client
+        import pythoncom
+
+def create_shortcut(target_path, shortcut_path, description="", icon_path=None, shell=None):
     """创建Windows快捷方式
     
     Args:
@@ -101,13 +175,17 @@ def create_shortcut(target_path, shortcut_path, description="", icon_path=None):
         shortcut_path: 快捷方式保存路径
         description: 快捷方式描述
         icon_path: 图标路径
+        shell: 已创建的WScript.Shell对象；传入时复用，不再单独初始化COM
     """
     if not WINDOWS:
         return False
     
+    owns_com = shell is None
     try:
         # 初始化COM库
-        pythoncom.CoInitialize()
+        if owns_com:
+            _load_win32()
+            pythoncom.CoInitialize()
         
         # 确保目标目录存在
         shortcut_dir = os.path.dirname(shortcut_path)
@@ -118,7 +196,8 @@ def create_shortcut(target_path, shortcut_path, description="", icon_path=None):
             except Exception as dir_error:
                 logging.warning(f"创建目录失败: {str(dir_error)}，将尝试直接创建快捷方式")
         
-        shell = win32com.client.Dispatch('WScript.Shell')
+        if owns_com:
+            shell = win32com.client.Dispatch('WScript.Shell')
         shortcut = shell.CreateShortCut(shortcut_path)
         shortcut.TargetPath = target_path
         shortcut.WorkingDirectory = os.path.dirname(target_path)
@@ -137,32 +216,49 @@ def create_shortcut(target_path, shortcut_path, description="", icon_path=None):
         return False
     finally:
         # 释放COM库
-        try:
-            pythoncom.CoUninitialize()
-        except:
-            pass
+        if owns_com and pythoncom is not None:
+            try:
+                pythoncom.CoUninitialize()
+            except:
+                pass
 
 def get_desktop_path():
-    """获取桌面路径"""
+    """获取桌面路径（通过SHGetKnownFolderPath直接查询，无需初始化COM）"""
     if not WINDOWS:
         return ""
     
     try:
-        # 初始化COM库
-        pythoncom.CoInitialize()
-        
-        shell = win32com.client.Dispatch('WScript.Shell')
-        result = shell.SpecialFolders('Desktop')
-        return result
+        import ctypes
+        from ctypes import wintypes
+
+        class GUID(ctypes.Structure):
+            _fields_ = [
+                ("Data1", wintypes.DWORD),
+                ("Data2", wintypes.WORD),
+                ("Data3", wintypes.WORD),
+                ("Data4", ctypes.c_ubyte * 8),
+            ]
+
+        # FOLDERID_Desktop = {B4BFCC3A-DB2C-424C-B029-7FE99A87C641}
+        folderid_desktop = GUID(
+            0xB4BFCC3A, 0xDB2C, 0x424C,
+            (ctypes.c_ubyte * 8)(0xB0, 0x29, 0x7F, 0xE9, 0x9A, 0x87, 0xC6, 0x41),
+        )
+        ppath = ctypes.c_void_p()
+        hr = ctypes.windll.shell32.SHGetKnownFolderPathW(
+            ctypes.byref(folderid_desktop), 0, None, ctypes.byref(ppath)
+        )
+        try:
+            if hr != 0 or not ppath.value:
+                raise OSError(f"SHGetKnownFolderPathW 返回 {hr:#x}")
+            return ctypes.wstring_at(ppath.value)
+        finally:
+            if ppath.value:
+                ctypes.windll.ole32.CoTaskMemFree(ppath)
     except Exception as e:
         logging.error(f"获取桌面路径失败: {str(e)}")
-        return os.path.join(os.path.expanduser('~'), 'Desktop')
-    finally:
-        # 释放COM库
-        try:
-            pythoncom.CoUninitialize()
-        except:
-            pass
+        profile = os.environ.get('USERPROFILE') or os.path.expanduser('~')
+        return os.path.join(profile, 'Desktop')
 
 def get_start_menu_path():
     """获取开始菜单路径"""
@@ -177,6 +273,62 @@ def get_start_menu_path():
         logging.error(f"获取开始菜单路径失败: {str(e)}")
         return ""
 
+class _QueueSink:
+    """供shutil.copyfileobj写入的适配对象：数据块转交队列，由写盘线程消费
+    
+    同时统计已写入字节数，每累计PROGRESS_STEP_BYTES调用一次on_progress(已写入字节数)
+    """
+    def __init__(self, chunk_queue: queue.Queue, errors: list, on_progress=None, written: int = 0):
+        self.chunk_queue = chunk_queue
+        self.errors = errors
+        self.on_progress = on_progress
+        self.written = written
+        self._last_reported = written
+
+    def write(self, chunk: bytes) -> int:
+        if self.errors:
+            raise self.errors[0]
+        self.chunk_queue.put(chunk)
+        self.written += len(chunk)
+        if self.on_progress and self.written - self._last_reported >= PROGRESS_STEP_BYTES:
+            self._last_reported = self.written
+            self.on_progress(self.written)
+        return len(chunk)
+
+class _BufferReader:
+    """内存缓冲区（mmap/BytesIO缓冲等）的只读文件视图，供zipfile读取
+    
+    每个实例独立维护读取位置，多个线程可各自持有一个共享同一缓冲区
+    """
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(self._pos + size, end)
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self):
+        self._view.release()
+
 # ===================== GUI主程序类 =====================
 class AppUpdater(tk.Tk):
     def __init__(self):
@@ -196,9 +348,10 @@ class AppUpdater(tk.Tk):
             "remote_archive_url": "http://49.51.50.251/jiaoyu/jiaoyu_win.zip",
             "archive_save_path": os.path.join(self.base_dir, "temp_update.zip"),
             "extract_dir": os.path.join(self.base_dir, "installed_program"),
+            "manifest_path": os.path.join(self.base_dir, "install_manifest.json"),
             "main_program_path": os.path.join(self.base_dir, "installed_program/jiaoyu_win/LuckyAi.exe"),
             "expected_hash": None,
-            "hash_algorithm": "md5"
+            "hash_algorithm": DEFAULT_HASH_ALGORITHM
         }
         
         # 初始化变量
@@ -208,9 +361,22 @@ class AppUpdater(tk.Tk):
         self.extract_progress = tk.DoubleVar()
         self.status_text = tk.StringVar(value="就绪")
         self.main_program_missing = False
+        self._downloaded_hash = ""  # 下载过程中流式计算的压缩包哈希（未配置预期哈希时不计算，为空）
+        self._archive_memory = None  # 下载到内存中的更新包（io.BytesIO），为None时使用磁盘上的临时文件
+        self._remote_cache = {}  # 上次远程版本响应的ETag/Last-Modified及版本号（条件请求用）
+        # 待执行的界面更新（同一key只保留最新一次），由主线程定时取出执行
+        self._ui_pending = {}
+        self._ui_lock = threading.Lock()
+        self._last_dl_ui = 0.0  # 上次提交下载进度的时间
+        self._last_ex_ui = 0.0  # 上次提交解压进度的时间
+        
+        # 下载用的HTTP会话在首次下载时才创建（requests/urllib3导入较慢，不拖慢启动）
+        self._session = None
+        self._session_lock = threading.Lock()
         
         # 构建UI
         self._build_ui()
+        self._drain_ui_queue()
         # 初始化流程
         self._load_local_version()
         self._check_main_program_exists()
@@ -218,6 +384,28 @@ class AppUpdater(tk.Tk):
         # 启动自动流程
         self.after(100, self._auto_update_flow)
 
+    def _get_session(self):
+        """返回下载更新包用的requests会话；首次调用时导入requests并创建"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                # 复用同一连接（keep-alive），续传探测(HEAD)与下载无需重复建立TCP连接
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=1,
+                    # 连接错误及网关类错误由urllib3按指数退避自动重试，不再用装饰器sleep重试
+                    max_retries=Retry(total=HTTP_MAX_RETRIES, backoff_factor=HTTP_RETRY_BACKOFF,
+                                      status_forcelist=HTTP_RETRY_STATUS)
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
     def _build_ui(self):
         """构建GUI界面"""
         self.grid_rowconfigure(0, weight=1)
@@ -292,24 +480,63 @@ class AppUpdater(tk.Tk):
         )
         self.run_btn.grid(row=0, column=2, padx=3, pady=2)
 
+    def _post_ui(self, key: str, func):
+        """提交界面更新到主线程执行（工作线程安全，同一key只保留最新一次）
+        
+        已在主线程时直接执行，不必等到下一次轮询
+        """
+        if threading.current_thread() is threading.main_thread():
+            with self._ui_lock:
+                # 丢弃同一key尚未执行的旧更新，避免之后被旧值覆盖
+                self._ui_pending.pop(key, None)
+            func()
+            return
+        with self._ui_lock:
+            self._ui_pending[key] = func
+
+    def _show_dialog(self, show, title: str, message: str):
+        """弹出消息对话框（工作线程安全），show为messagebox.showerror等
+        
+        对话框是模态的，交给after_idle在本轮界面更新执行完后再弹出，
+        弹窗期间其余界面更新照常刷新
+        """
+        self._post_ui(f"dialog_{show.__name__}", lambda: self.after_idle(show, title, message))
+
+    def _show_error(self, title: str, message: str):
+        """弹出错误对话框（工作线程安全）"""
+        self._show_dialog(messagebox.showerror, title, message)
+
+    def _drain_ui_queue(self):
+        """主线程定时执行待处理的界面更新"""
+        with self._ui_lock:
+            pending, self._ui_pending = self._ui_pending, {}
+        for func in pending.values():
+            try:
+                func()
+            except Exception as e:
+                logging.error(f"界面更新失败: {str(e)}")
+        self.after(UI_POLL_INTERVAL_MS, self._drain_ui_queue)
+
     def _disable_all_buttons(self):
         """禁用所有操作按钮"""
-        self.check_btn.config(state=tk.DISABLED)
-        self.update_btn.config(state=tk.DISABLED)
-        self.run_btn.config(state=tk.DISABLED)
-        self.update_idletasks()  # 强制刷新UI
+        def apply():
+            self.check_btn.config(state=tk.DISABLED)
+            self.update_btn.config(state=tk.DISABLED)
+            self.run_btn.config(state=tk.DISABLED)
+        self._post_ui("buttons", apply)
 
     def _enable_buttons_normal(self):
         """恢复按钮正常状态"""
-        self.check_btn.config(state=tk.NORMAL)
-        # 根据状态决定更新/运行按钮
-        if compare_versions(self.remote_version, self.local_version) > 0 or self.main_program_missing:
-            self.update_btn.config(state=tk.NORMAL)
-            self.run_btn.config(state=tk.DISABLED)
-        else:
-            self.update_btn.config(state=tk.DISABLED)
-            self.run_btn.config(state=tk.NORMAL)
-        self.update_idletasks()
+        def apply():
+            self.check_btn.config(state=tk.NORMAL)
+            # 根据状态决定更新/运行按钮
+            if compare_versions(self.remote_version, self.local_version) > 0 or self.main_program_missing:
+                self.update_btn.config(state=tk.NORMAL)
+                self.run_btn.config(state=tk.DISABLED)
+            else:
+                self.update_btn.config(state=tk.DISABLED)
+                self.run_btn.config(state=tk.NORMAL)
+        self._post_ui("buttons", apply)
 
     def _check_main_program_exists(self):
         """检查主程序是否存在"""
@@ -325,7 +552,11 @@ class AppUpdater(tk.Tk):
         """自动更新流程（核心调整：仅获取远程版本号，不提前同步）"""
         self.is_auto_running = True
         self._disable_all_buttons()  # 自动流程开始就禁用所有按钮
-        
+        # 网络请求放到后台线程，避免阻塞Tk主线程导致窗口无响应
+        threading.Thread(target=self._check_update_auto_worker, daemon=True).start()
+
+    def _check_update_auto_worker(self):
+        """后台线程：获取远程版本号并对比，界面操作交回主线程执行"""
         try:
             # 第一步：仅获取远程版本号并刷新UI（不同步本地版本号）
             self._update_status("正在获取远程版本信息...")
@@ -336,38 +567,71 @@ class AppUpdater(tk.Tk):
                 self._update_status("主程序缺失，开始修复下载...")
                 self._update_thread_auto(fix_mode=True)
             else:
-                self._check_update_auto()
+                self._update_status("正在检查更新...")
+                compare_result = compare_versions(self.remote_version, self.local_version)
+                logging.info(f"版本对比：本地{self.local_version}，远程{self.remote_version}，结果{compare_result}")
+                self._post_ui("version_result", lambda: self._on_version_result(compare_result))
         except Exception as e:
             logging.error(f"自动流程初始化失败: {str(e)}")
             self._update_status(f"初始化失败: {str(e)}")
             self._enable_buttons_normal()
             self.is_auto_running = False
 
-    @retry(max_retries=3, delay=1)
     def _fetch_remote_version(self):
         """单独获取远程版本号（仅刷新UI，不修改本地版本）"""
         try:
-            response = requests.get(self.config["remote_version_url"], timeout=10)
-            response.raise_for_status()
-            remote_data = response.json()
-            self.remote_version = remote_data.get("version", "0.0.0")
+            # 带上次的ETag/Last-Modified发起条件请求，未变化时服务器返回304且无响应体
+            headers = {}
+            if self._remote_cache.get("version"):
+                if self._remote_cache.get("etag"):
+                    headers["If-None-Match"] = self._remote_cache["etag"]
+                if self._remote_cache.get("last_modified"):
+                    headers["If-Modified-Since"] = self._remote_cache["last_modified"]
+            # 版本文件很小，用标准库urllib获取即可，启动时不必为此加载requests
+            request = urllib.request.Request(self.config["remote_version_url"], headers=headers)
+            try:
+                with urlopen_with_retry(request, timeout=10) as response:
+                    remote_data = json.loads(response.read())
+                    response_headers = response.headers
+                not_modified = False
+            except urllib.error.HTTPError as e:
+                # urllib把304当作HTTPError抛出
+                if e.code != 304 or not headers:
+                    raise
+                not_modified = True
+            if not_modified:
+                remote_data = self._remote_cache
+                self.remote_version = remote_data["version"]
+                logging.info(f"远程版本文件未变化(304)，使用缓存的远程版本号：{self.remote_version}")
+            else:
+                self.remote_version = remote_data.get("version", "0.0.0")
+                remote_cache = {
+                    "etag": response_headers.get("ETag"),
+                    "last_modified": response_headers.get("Last-Modified"),
+                    "version": self.remote_version,
+                    "hash": remote_data.get("hash"),
+                    "hash_algorithm": remote_data.get("hash_algorithm")
+                }
+                if (remote_cache["etag"] or remote_cache["last_modified"]) and remote_cache != self._remote_cache:
+                    self._remote_cache = remote_cache
+                    self._save_remote_cache()
+            
+            # 版本文件可附带更新包哈希（hash，及可选的hash_algorithm，默认blake2b），用于下载后校验
+            if remote_data.get("hash"):
+                self.config["expected_hash"] = remote_data["hash"].lower()
+                self.config["hash_algorithm"] = remote_data.get("hash_algorithm") or DEFAULT_HASH_ALGORITHM
             
             # 仅刷新远程版本号UI，不修改本地版本
-            self.remote_version_label.config(text=self.remote_version)
-            self.update_idletasks()
+            remote_version = self.remote_version
+            self._post_ui("remote_version", lambda: self.remote_version_label.config(text=remote_version))
             logging.info(f"远程版本号获取成功：{self.remote_version}，本地版本号仍为：{self.local_version}")
         except Exception as e:
             logging.error(f"获取远程版本号失败: {str(e)}")
             raise
 
-    def _check_update_auto(self):
-        """自动检查版本更新"""
-        self._update_status("正在检查更新...")
-        
+    def _on_version_result(self, compare_result: int):
+        """自动检查版本更新的结果处理（主线程执行）"""
         try:
-            compare_result = compare_versions(self.remote_version, self.local_version)
-            logging.info(f"版本对比：本地{self.local_version}，远程{self.remote_version}，结果{compare_result}")
-            
             if compare_result > 0:
                 self._update_status(f"发现新版本: {self.remote_version} (当前: {self.local_version})")
                 self._update_thread_auto()
@@ -414,14 +678,12 @@ class AppUpdater(tk.Tk):
         # 2. 验证文件完整性
         if self.config["expected_hash"]:
             self._update_status("验证文件完整性...")
-            file_hash = calculate_file_hash(
-                self.config["archive_save_path"],
-                self.config["hash_algorithm"]
-            )
-            if file_hash != self.config["expected_hash"]:
+            # 哈希已在下载时流式计算，无需再次读取整个文件
+            file_hash = self._downloaded_hash
+            if not hmac.compare_digest(file_hash, self.config["expected_hash"]):
                 self._update_status("文件哈希值不匹配")
-                os.remove(self.config["archive_save_path"])
-                messagebox.showerror("错误", "文件损坏，更新/修复失败")
+                self._discard_archive()
+                self._show_error("错误", "文件损坏，更新/修复失败")
                 logging.error(f"哈希校验失败：预期{self.config['expected_hash']}，实际{file_hash}")
                 return
         
@@ -429,18 +691,18 @@ class AppUpdater(tk.Tk):
         self._update_status("开始解压文件...")
         if not self._extract_archive():
             self._update_status("解压失败")
+            self._discard_archive()  # 释放内存中的更新包
             return
         
         # 4. 核心调整：仅在下载解压完成后，同步本地版本号（关键时机）
         self._update_status(f"同步本地版本号为 {self.remote_version}...")
         self._save_local_version(self.remote_version)  # 写入版本文件
         self.local_version = self.remote_version  # 更新内存中的本地版本号
-        self.local_version_label.config(text=self.local_version)  # 刷新本地版本UI
-        self.update_idletasks()
+        local_version = self.local_version
+        self._post_ui("local_version", lambda: self.local_version_label.config(text=local_version))  # 刷新本地版本UI
         
         # 5. 清理临时文件
-        if os.path.exists(self.config["archive_save_path"]):
-            os.remove(self.config["archive_save_path"])
+        self._discard_archive()
         
         # 6. 完成提示并运行程序
         finish_text = "主程序修复完成！" if fix_mode else "更新完成！"
@@ -449,25 +711,26 @@ class AppUpdater(tk.Tk):
         
         # 重新检查主程序
         self._check_main_program_exists()
-        # 恢复按钮+运行程序
+        # 恢复按钮+运行程序（启动程序、创建快捷方式及退出窗口都交回主线程执行）
         self._enable_buttons_normal()
-        self._run_program()
+        self._post_ui("run_program", self._run_program)
 
     def _load_local_version(self):
         """加载本地版本号（仅读取，不提前同步）"""
         try:
-            if os.path.exists(self.config["local_version_path"]):
-                with open(self.config["local_version_path"], "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.local_version = data.get("version", "0.0.0")
-                self.local_version_label.config(text=self.local_version)
-                logging.info(f"加载本地版本号：{self.local_version}")
-            else:
-                self._update_status("本地版本文件缺失，初始化版本信息为0.0.0...")
-                self.local_version = "0.0.0"
-                self._save_local_version(self.local_version)  # 仅初始化，不同步远程
-                self.local_version_label.config(text=self.local_version)
-                logging.info("本地版本文件缺失，已初始化为0.0.0（未同步远程）")
+            # 直接打开，文件不存在时走FileNotFoundError分支（省去exists预检查）
+            with open(self.config["local_version_path"], "r", encoding="utf-8") as f:
+                data = json.load(f)
+                self.local_version = data.get("version", "0.0.0")
+                self._remote_cache = data.get("remote_cache") or {}
+            self.local_version_label.config(text=self.local_version)
+            logging.info(f"加载本地版本号：{self.local_version}")
+        except FileNotFoundError:
+            self._update_status("本地版本文件缺失，初始化版本信息为0.0.0...")
+            self.local_version = "0.0.0"
+            self._save_local_version(self.local_version)  # 仅初始化，不同步远程
+            self.local_version_label.config(text=self.local_version)
+            logging.info("本地版本文件缺失，已初始化为0.0.0（未同步远程）")
         except Exception as e:
             error_msg = f"加载本地版本失败: {str(e)}"
             self._update_status(error_msg)
@@ -477,38 +740,62 @@ class AppUpdater(tk.Tk):
             self._save_local_version(self.local_version)
             self.local_version_label.config(text="0.0.0")
 
+    def _write_local_version_file(self, version: str):
+        """写入版本文件（版本号+远程响应缓存），失败时抛出异常"""
+        # 确保目录存在
+        os.makedirs(os.path.dirname(self.config["local_version_path"]), exist_ok=True)
+        # 先写临时文件再原子替换，进程中途退出也不会留下损坏的版本文件
+        tmp_path = self.config["local_version_path"] + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "remote_cache": self._remote_cache}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.config["local_version_path"])
+
     def _save_local_version(self, version: str):
         """保存本地版本号（增强可靠性，仅在解压完成后调用）"""
         try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(self.config["local_version_path"]), exist_ok=True)
-            # 写入版本文件（指定编码，避免乱码）
-            with open(self.config["local_version_path"], "w", encoding="utf-8") as f:
-                json.dump({"version": version}, f, indent=2, ensure_ascii=False)
+            self._write_local_version_file(version)
             logging.info(f"本地版本号已写入文件：{version}，路径：{self.config['local_version_path']}")
         except Exception as e:
             error_msg = f"保存版本号失败: {str(e)}"
             self._update_status(error_msg)
             logging.error(error_msg)
             # 保存失败时弹窗提示
-            messagebox.warning("警告", f"版本号保存失败:\n{str(e)}\n可能导致后续更新异常！")
+            self._show_dialog(messagebox.showwarning, "警告", f"版本号保存失败:\n{str(e)}\n可能导致后续更新异常！")
+
+    def _save_remote_cache(self):
+        """持久化远程版本响应缓存（仅是条件请求的优化，失败只记日志，不影响版本检查）"""
+        try:
+            self._write_local_version_file(self.local_version)
+        except Exception as e:
+            logging.warning(f"保存远程版本缓存失败: {str(e)}")
 
     def _update_status(self, text: str):
         """更新状态文本"""
-        self.status_text.set(text)
-        self.update_idletasks()
+        self._post_ui("status", lambda: self.status_text.set(text))
 
     def _update_download_progress(self, progress: float):
-        """更新下载进度条"""
-        self.download_progress.set(progress)
-        self.download_label.config(text=f"{progress:.1f}%")
-        self.update_idletasks()
+        """更新下载进度条（限频，100%时总是刷新）"""
+        now = time.monotonic()
+        if progress < 100 and now - self._last_dl_ui < PROGRESS_MIN_INTERVAL:
+            return
+        self._last_dl_ui = now
+        
+        def apply():
+            self.download_progress.set(progress)
+            self.download_label.config(text=f"{progress:.1f}%")
+        self._post_ui("download_progress", apply)
 
     def _update_extract_progress(self, progress: float):
-        """更新解压进度条"""
-        self.extract_progress.set(progress)
-        self.extract_label.config(text=f"{progress:.1f}%")
-        self.update_idletasks()
+        """更新解压进度条（限频，100%时总是刷新）"""
+        now = time.monotonic()
+        if progress < 100 and now - self._last_ex_ui < PROGRESS_MIN_INTERVAL:
+            return
+        self._last_ex_ui = now
+        
+        def apply():
+            self.extract_progress.set(progress)
+            self.extract_label.config(text=f"{progress:.1f}%")
+        self._post_ui("extract_progress", apply)
 
     def _check_update_thread(self):
         """手动检查更新线程"""
@@ -529,31 +816,24 @@ class AppUpdater(tk.Tk):
             
             compare_result = compare_versions(self.remote_version, self.local_version)
             
+            # 按钮状态统一由finally中的_enable_buttons_normal按版本/主程序状态提交到主线程
             if compare_result > 0:
                 self._update_status(f"发现新版本: {self.remote_version} (当前: {self.local_version})")
-                self.update_btn.config(state=tk.NORMAL)
-                self.run_btn.config(state=tk.DISABLED)
             elif compare_result == 0:
                 # 检查主程序是否缺失
                 self._check_main_program_exists()
                 if self.main_program_missing:
                     self._update_status("版本最新但主程序缺失，请点击【立即更新】修复")
-                    self.update_btn.config(state=tk.NORMAL)
-                    self.run_btn.config(state=tk.DISABLED)
                 else:
                     self._update_status("当前已是最新版本，主程序正常")
-                    self.update_btn.config(state=tk.DISABLED)
-                    self.run_btn.config(state=tk.NORMAL)
             else:
                 self._update_status(f"本地版本较新: {self.local_version} (远程: {self.remote_version})")
-                self.update_btn.config(state=tk.DISABLED)
-                self.run_btn.config(state=tk.NORMAL)
                 
         except Exception as e:
             error_msg = f"检查更新失败: {str(e)}"
             self._update_status(error_msg)
             logging.error(error_msg)
-            messagebox.showerror("错误", f"检查更新失败:\n{str(e)}")
+            self._show_error("错误", f"检查更新失败:\n{str(e)}")
         finally:
             self._enable_buttons_normal()
 
@@ -581,14 +861,12 @@ class AppUpdater(tk.Tk):
             # 2. 验证文件完整性
             if self.config["expected_hash"]:
                 self._update_status("验证文件完整性...")
-                file_hash = calculate_file_hash(
-                    self.config["archive_save_path"],
-                    self.config["hash_algorithm"]
-                )
-                if file_hash != self.config["expected_hash"]:
+                # 哈希已在下载时流式计算，无需再次读取整个文件
+                file_hash = self._downloaded_hash
+                if not hmac.compare_digest(file_hash, self.config["expected_hash"]):
                     self._update_status("文件哈希值不匹配")
-                    os.remove(self.config["archive_save_path"])
-                    messagebox.showerror("错误", "文件损坏，更新/修复失败")
+                    self._discard_archive()
+                    self._show_error("错误", "文件损坏，更新/修复失败")
                     logging.error(f"哈希校验失败：预期{self.config['expected_hash']}，实际{file_hash}")
                     return
             
@@ -596,18 +874,18 @@ class AppUpdater(tk.Tk):
             self._update_status("开始解压文件...")
             if not self._extract_archive():
                 self._update_status("解压失败")
+                self._discard_archive()  # 释放内存中的更新包
                 return
             
             # 4. 仅在解压完成后同步版本号
             self._update_status(f"同步本地版本号为 {self.remote_version}...")
             self._save_local_version(self.remote_version)
             self.local_version = self.remote_version
-            self.local_version_label.config(text=self.local_version)
-            self.update_idletasks()
+            local_version = self.local_version
+            self._post_ui("local_version", lambda: self.local_version_label.config(text=local_version))
             
             # 5. 清理临时文件
-            if os.path.exists(self.config["archive_save_path"]):
-                os.remove(self.config["archive_save_path"])
+            self._discard_archive()
             
             # 6. 完成提示
             finish_text = "主程序修复完成！" if fix_mode else "更新完成！"
@@ -619,62 +897,205 @@ class AppUpdater(tk.Tk):
         finally:
             self._enable_buttons_normal()
 
+    def _get_resume_offset(self, archive_path: str, part_path: str) -> int:
+        """检查上次中断的下载能否断点续传，返回已下载字节数（不能续传时返回0）"""
+        try:
+            with open(part_path, "r", encoding="utf-8") as f:
+                part_info = json.load(f)
+            downloaded_size = os.path.getsize(archive_path)
+        except (FileNotFoundError, ValueError):
+            return 0
+        
+        content_length = part_info.get("content_length", 0)
+        if not 0 < downloaded_size < content_length:
+            return 0
+        # 远程文件大小（及ETag）与上次一致才续传，否则从头下载
+        import requests
+        try:
+            head = self._get_session().head(
+                self.config["remote_archive_url"],
+                headers={"Accept-Encoding": "identity"},
+                timeout=10,
+                allow_redirects=True
+            )
+        except requests.RequestException as e:
+            # 续传只是优化，探测失败时直接完整下载
+            logging.warning(f"断点续传探测失败，改为完整下载: {str(e)}")
+            return 0
+        etag = head.headers.get("ETag")
+        if (head.status_code != 200
+                or int(head.headers.get("Content-Length", 0)) != content_length
+                or (etag and part_info.get("etag") and etag != part_info["etag"])):
+            logging.info("远程更新包已变化，放弃断点续传")
+            return 0
+        return downloaded_size
+
     def _download_archive(self) -> bool:
-        """下载压缩包（带进度）"""
+        """下载压缩包（带进度，支持断点续传）"""
+        archive_path = self.config["archive_save_path"]
+        # 记录本次下载的总大小/ETag，中断后据此判断能否续传
+        part_path = archive_path + ".part"
+        memory_file = None
+        response = None
         try:
-            response = requests.get(
+            resume_from = self._get_resume_offset(archive_path, part_path)
+            # 压缩包本身已压缩，禁用传输层gzip避免重复压缩/解压
+            headers = {"Accept-Encoding": "identity"}
+            if resume_from:
+                headers["Range"] = f"bytes={resume_from}-"
+            response = self._get_session().get(
                 self.config["remote_archive_url"],
+                headers=headers,
                 stream=True,
                 timeout=30
             )
             response.raise_for_status()
             
-            total_size = int(response.headers.get("Content-Length", 0))
-            downloaded_size = 0
+            self._downloaded_hash = ""
+            # 仅在需要校验（提供了预期哈希）时才计算哈希，否则不做任何哈希运算
+            verify = bool(self.config["expected_hash"])
+            hash_obj = None
+            if resume_from and response.status_code == 206:
+                logging.info(f"断点续传，从{resume_from}字节处继续下载")
+                if verify:
+                    # 已下载部分先计入哈希，保证最终摘要覆盖整个文件
+                    hash_obj = file_hash_object(archive_path, self.config["hash_algorithm"])
+                file_mode = "ab"
+            else:
+                resume_from = 0
+                if verify:
+                    # 边下载边计算哈希，省去下载后再读一遍文件
+                    hash_obj = hashlib.new(self.config["hash_algorithm"])
+                file_mode = "wb"
+            
+            content_length = int(response.headers.get("Content-Length", 0))
+            total_size = resume_from + content_length if content_length else 0
+            part_info = {"content_length": total_size, "etag": response.headers.get("ETag")}
+            # 体积不大的更新包直接下载到内存，解压时直接读内存，省去写临时文件再读回
+            self._archive_memory = None
+            in_memory = not resume_from and 0 < total_size <= MEMORY_ARCHIVE_MAX_BYTES
+            if in_memory and os.path.exists(archive_path):
+                os.remove(archive_path)  # 删除无法续传的残留临时文件
+            if not resume_from and total_size and not in_memory:
+                with open(part_path, "w", encoding="utf-8") as f:
+                    json.dump(part_info, f)
+            
+            # 流水线：当前线程只负责接收网络数据，写盘+哈希交给写入线程，两者并行
+            chunk_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+            write_errors = []
+            
+            def writer(f):
+                try:
+                    if hash_obj is None:
+                        while (chunk := chunk_queue.get()) is not None:
+                            f.write(chunk)
+                    else:
+                        while (chunk := chunk_queue.get()) is not None:
+                            f.write(chunk)
+                            hash_obj.update(chunk)
+                except Exception as e:
+                    write_errors.append(e)
+                    # 继续取空队列，避免下载线程阻塞在put上
+                    while chunk_queue.get() is not None:
+                        pass
             
-            with open(self.config["archive_save_path"], "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded_size / total_size) * 100
-                            self._update_download_progress(progress)
+            def report_progress(written):
+                if total_size > 0:
+                    self._update_download_progress((written / total_size) * 100)
             
+            # 写入适配对象按字节数累计上报进度，无需逐块判断
+            sink = _QueueSink(chunk_queue, write_errors, on_progress=report_progress, written=resume_from)
+            
+            # 直接从底层连接大块读取，省去逐块的Python循环
+            response.raw.decode_content = True
+            if in_memory:
+                memory_file = f = io.BytesIO()
+            else:
+                f = open_sequential(archive_path, file_mode)
+            try:
+                writer_thread = threading.Thread(target=writer, args=(f,), daemon=True)
+                writer_thread.start()
+                try:
+                    shutil.copyfileobj(response.raw, sink, COPY_BUFSIZE)
+                finally:
+                    chunk_queue.put(None)
+                    writer_thread.join()
+            finally:
+                if not in_memory:
+                    f.close()
+            if write_errors:
+                raise write_errors[0]
+            
+            if hash_obj is not None:
+                self._downloaded_hash = hash_obj.hexdigest()
+            if in_memory:
+                self._archive_memory = memory_file
+            if os.path.exists(part_path):
+                os.remove(part_path)
             self._update_download_progress(100.0)
             self._update_status("下载完成")
-            logging.info(f"更新包下载完成，路径：{self.config['archive_save_path']}，大小：{total_size/1024/1024:.2f}MB")
+            location = "内存" if in_memory else archive_path
+            logging.info(f"更新包下载完成，位置：{location}，大小：{total_size/1024/1024:.2f}MB")
             return True
             
         except Exception as e:
             error_msg = f"下载错误: {str(e)}"
             self._update_status(error_msg)
             logging.error(error_msg)
-            if os.path.exists(self.config["archive_save_path"]):
-                os.remove(self.config["archive_save_path"])
-            messagebox.showerror("错误", f"下载失败:\n{str(e)}")
+            if memory_file is not None and memory_file.tell() > 0:
+                # 内存中已收到的数据落盘，下次仍可断点续传
+                try:
+                    with open(archive_path, "wb") as f:
+                        f.write(memory_file.getbuffer())
+                    with open(part_path, "w", encoding="utf-8") as f:
+                        json.dump(part_info, f)
+                except Exception as save_error:
+                    logging.warning(f"保存未完成的下载失败: {str(save_error)}")
+            if os.path.exists(archive_path):
+                if os.path.exists(part_path):
+                    # 保留已下载部分，下次启动时断点续传
+                    logging.info(f"保留未完成的下载（{os.path.getsize(archive_path)}字节），下次继续")
+                else:
+                    os.remove(archive_path)
+            self._show_error("错误", f"下载失败:\n{str(e)}")
             return False
+        finally:
+            # 关闭响应：已读完的连接归还连接池供后续请求复用(keep-alive)，中途失败的则释放套接字
+            if response is not None:
+                response.close()
+
+    def _discard_archive(self):
+        """丢弃已下载的更新包（内存中的数据或磁盘临时文件）"""
+        self._archive_memory = None
+        if os.path.exists(self.config["archive_save_path"]):
+            os.remove(self.config["archive_save_path"])
 
     def _extract_archive(self) -> bool:
         """解压压缩包"""
         try:
-            if os.path.exists(self.config["extract_dir"]):
-                shutil.rmtree(self.config["extract_dir"])
+            # 不再整体删除重建：对比上次的文件清单，只解压有变化的文件
             os.makedirs(self.config["extract_dir"], exist_ok=True)
+            manifest = self._load_manifest()
+            # 解压中途失败时清单不可信，先删除，成功后再写入新清单
+            if os.path.exists(self.config["manifest_path"]):
+                os.remove(self.config["manifest_path"])
             
             archive_path = self.config["archive_save_path"]
-            if archive_path.endswith('.zip'):
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    total_files = len(zip_ref.infolist())
-                    extracted_files = 0
-                    
-                    for file in zip_ref.infolist():
-                        zip_ref.extract(file, self.config["extract_dir"])
-                        extracted_files += 1
-                        progress = (extracted_files / total_files) * 100
-                        self._update_extract_progress(progress)
-            else:
+            if not archive_path.endswith('.zip'):
                 raise ValueError(f"不支持的格式: {archive_path}")
+            if self._archive_memory is not None:
+                # 更新包已在内存中，直接解压，无需读临时文件
+                with self._archive_memory.getbuffer() as buffer:
+                    infos = self._extract_zip_buffer(buffer, manifest)
+            else:
+                # 磁盘上的更新包以只读mmap映射后解压
+                with open_sequential(archive_path, 'rb') as archive_file, \
+                        mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    infos = self._extract_zip_buffer(mapped, manifest)
+            self._remove_stale_files(self.config["extract_dir"], infos)
+            self._save_manifest(infos)
             
             self._update_extract_progress(100.0)
             self._update_status("解压完成")
@@ -685,9 +1106,138 @@ class AppUpdater(tk.Tk):
             error_msg = f"解压错误: {str(e)}"
             self._update_status(error_msg)
             logging.error(error_msg)
-            messagebox.showerror("错误", f"解压失败:\n{str(e)}")
+            self._show_error("错误", f"解压失败:\n{str(e)}")
             return False
 
+    def _extract_zip_buffer(self, buffer, manifest: dict) -> list:
+        """从内存缓冲区（mmap或BytesIO缓冲）解压zip，返回条目列表"""
+        reader = _BufferReader(buffer)
+        try:
+            with zipfile.ZipFile(reader, 'r') as zip_ref:
+                infos = zip_ref.infolist()
+        finally:
+            reader.close()
+        self._extract_zip_parallel(buffer, self.config["extract_dir"], infos, manifest)
+        return infos
+
+    def _load_manifest(self) -> dict:
+        """读取上次解压的文件清单（条目名 -> [大小, CRC32]），不存在则返回空字典"""
+        try:
+            with open(self.config["manifest_path"], "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"读取文件清单失败: {str(e)}，将完整解压")
+            return {}
+
+    def _save_manifest(self, infos: list):
+        """保存本次解压的文件清单，供下次增量解压对比"""
+        manifest = {info.filename: [info.file_size, info.CRC] for info in infos if not info.is_dir()}
+        tmp_path = self.config["manifest_path"] + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.config["manifest_path"])
+
+    def _remove_stale_files(self, extract_dir: str, infos: list):
+        """删除新压缩包中已不存在的旧文件及空目录"""
+        root = os.path.abspath(extract_dir)
+        expected = {
+            os.path.normcase(os.path.normpath(os.path.join(root, info.filename)))
+            for info in infos
+        }
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.path.normcase(path) not in expected:
+                    os.remove(path)
+                    logging.info(f"删除旧文件: {path}")
+            if dirpath != root and os.path.normcase(dirpath) not in expected and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    def _extract_zip_parallel(self, buffer, extract_dir: str, infos: list,
+                              manifest: Optional[dict] = None):
+        """多线程解压zip条目（zlib解压时释放GIL，条目分片后每个线程使用独立的ZipFile句柄）
+        
+        buffer为整个压缩包的内存缓冲区（mmap或BytesIO缓冲），
+        各线程的ZipFile共享同一缓冲区、各自维护读取位置
+        
+        manifest中记录的大小/CRC32与条目一致且磁盘文件大小相同的，视为未变化并跳过
+        """
+        manifest = manifest or {}
+        if not infos:
+            return
+        
+        # 一次性校验所有条目路径（防Zip Slip），有非法路径则在解压前整体拒绝；
+        # 工作线程直接使用这里算好的目标路径，不再重复校验
+        root = os.path.abspath(extract_dir)
+        entries = []
+        dirs = set()
+        for info in infos:
+            target = os.path.normpath(os.path.join(root, info.filename))
+            if os.path.commonpath([root, target]) != root:
+                raise ValueError(f"压缩包条目路径非法: {info.filename}")
+            if info.is_dir():
+                dirs.add(target)
+            else:
+                dirs.add(os.path.dirname(target))
+                entries.append((info, target))
+        
+        # 串行一次性预建所有目录（去重后按层级排序），
+        # 既避免多个线程竞争创建同一目录，也省去每个条目重复的stat/mkdir
+        for d in sorted(dirs, key=len):
+            os.makedirs(d, exist_ok=True)
+        
+        if not entries:
+            return
+        # 进度按解压后的字节数加权，单个大文件不会让进度条长时间停滞后突然跳到100%
+        total_bytes = sum(info.file_size for info, _ in entries) or 1
+        done_bytes = 0
+        lock = threading.Lock()
+        failed = threading.Event()
+        
+        # 按大小从大到小轮流分配，得到N个大致均衡的分片，每个线程处理一个分片
+        workers = min(os.cpu_count() or 1, len(entries))
+        entries.sort(key=lambda entry: entry[0].file_size, reverse=True)
+        shards = [entries[i::workers] for i in range(workers)]
+        
+        def extract_shard(shard):
+            nonlocal done_bytes
+            # ZipFile共享句柄非线程安全，每个分片各自打开一次
+            reader = _BufferReader(buffer)
+            try:
+                with zipfile.ZipFile(reader, 'r') as zip_ref:
+                    for info, target in shard:
+                        if failed.is_set():
+                            return
+                        # 目录已预建、路径已校验，直接写文件
+                        unchanged = False
+                        if manifest.get(info.filename) == [info.file_size, info.CRC]:
+                            try:
+                                unchanged = os.stat(target).st_size == info.file_size
+                            except OSError:
+                                unchanged = False
+                        if not unchanged:
+                            with zip_ref.open(info) as src, open(target, "wb") as dst:
+                                shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+                        with lock:
+                            done_bytes += info.file_size
+                            progress = (done_bytes / total_bytes) * 100
+                            self._update_extract_progress(progress)
+            finally:
+                # 释放对缓冲区的引用，之后才能关闭mmap
+                reader.close()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(extract_shard, shard) for shard in shards]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                # 通知其余分片尽快停止
+                failed.set()
+                raise
+
     def _run_program(self):
         """运行主程序"""
         import subprocess
@@ -711,6 +1261,19 @@ class AppUpdater(tk.Tk):
             logging.error(error_msg)
             messagebox.showerror("错误", f"启动程序失败:\n{str(e)}")
     
+    def _with_wsh(self, fn):
+        """初始化一次COM并创建一个WScript.Shell，供fn(shell)复用，结束后释放COM"""
+        _load_win32()
+        pythoncom.CoInitialize()
+        try:
+            shell = win32com.client.Dispatch('WScript.Shell')
+            return fn(shell)
+        finally:
+            try:
+                pythoncom.CoUninitialize()
+            except:
+                pass
+
     def _create_shortcuts(self, program_path):
         """创建桌面快捷方式和开始菜单快捷方式"""
         if not WINDOWS:
@@ -724,28 +1287,28 @@ class AppUpdater(tk.Tk):
             # 获取图标路径（使用程序自身作为图标）
             icon_path = program_path
             
-            # 创建桌面快捷方式
-            desktop_path = get_desktop_path()
-            if desktop_path:
-                desktop_shortcut = os.path.join(desktop_path, shortcut_name)
-                if not os.path.exists(desktop_shortcut):
-                    success = create_shortcut(program_path, desktop_shortcut, description, icon_path)
-                    if not success:
-                        logging.warning("桌面快捷方式创建失败，但不影响程序运行")
+            # 先确定需要创建的快捷方式（桌面/开始菜单路径均无需COM即可获取）
+            missing = []
+            for label, folder in (("桌面", get_desktop_path()), ("开始菜单", get_start_menu_path())):
+                if not folder:
+                    continue
+                shortcut_path = os.path.join(folder, shortcut_name)
+                if os.path.exists(shortcut_path):
+                    logging.info(f"{label}快捷方式已存在，跳过创建")
                 else:
-                    logging.info("桌面快捷方式已存在，跳过创建")
+                    missing.append((label, shortcut_path))
+            # 都已存在时（常见的启动路径）不导入pywin32、不初始化COM
+            if not missing:
+                return
             
-            # 创建开始菜单快捷方式
-            start_menu_path = get_start_menu_path()
-            if start_menu_path:
-                start_menu_shortcut = os.path.join(start_menu_path, shortcut_name)
-                if not os.path.exists(start_menu_shortcut):
-                    success = create_shortcut(program_path, start_menu_shortcut, description, icon_path)
+            def create_all(shell):
+                for label, shortcut_path in missing:
+                    success = create_shortcut(program_path, shortcut_path, description, icon_path, shell)
                     if not success:
-                        logging.warning("开始菜单快捷方式创建失败，但不影响程序运行")
-                else:
-                    logging.info("开始菜单快捷方式已存在，跳过创建")
+                        logging.warning(f"{label}快捷方式创建失败，但不影响程序运行")
             
+            # COM初始化与WScript.Shell创建只做一次，需要创建的快捷方式共用
+            self._with_wsh(create_all)
             logging.info("快捷方式创建流程完成")
         except Exception as e:
             logging.error(f"创建快捷方式过程中出错: {str(e)}")
@@ -758,26 +1321,14 @@ if __name__ == "__main__":
         messagebox.showerror("错误", "需要Python 3.6或更高版本")
         sys.exit(1)
     
-    try:
-        import requests
-    except ImportError:
-        messagebox.showinfo("提示", "正在安装依赖库 requests...")
-        os.system(f"{sys.executable} -m pip install requests")
-        import requests
-    
-    # 检查并安装pywin32库（Windows平台需要）
+    # 检查并安装pywin32库（Windows平台需要）；只查找不导入，真正导入推迟到创建快捷方式时
     if WINDOWS:
-        try:
-            import win32com.client
-            import winreg
-        except ImportError:
+        import importlib.util
+        if importlib.util.find_spec("win32com") is None:
             messagebox.showinfo("提示", "正在安装依赖库 pywin32...")
             os.system(f"{sys.executable} -m pip install pywin32")
-            try:
-                import win32com.client
-                import winreg
-                WINDOWS = True
-            except ImportError:
+            importlib.invalidate_caches()
+            if importlib.util.find_spec("win32com") is None:
                 WINDOWS = False
                 logging.warning("安装pywin32失败，将无法创建快捷方式")
     